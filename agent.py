@@ -2,9 +2,13 @@
 Real Estate Deal Analyzer Agent using OpenAI Assistants API
 """
 
-import json
-from openai import OpenAI
-from config import OPENAI_API_KEY
+import asyncio
+import os
+import orjson
+from typing import Callable, Dict
+from openai import OpenAI, AsyncOpenAI, NotFoundError, RateLimitError, APIConnectionError, InternalServerError
+from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
+from config import OPENAI_API_KEY, ASSISTANT_RUN_TIMEOUT, ASSISTANT_ID_FILE
 from functions.realtor_api import get_property_details, get_comparable_properties, extract_property_info
 from functions.deal_calculator import (
     calculate_arv_from_comps,
@@ -14,8 +18,25 @@ from functions.deal_calculator import (
 )
 
 
-# Initialize OpenAI client
+# Initialize OpenAI clients (sync for one-off setup, async for runs).
+# SDK-level retries are disabled on the async client because
+# _retry_transient owns retrying plain requests; run streams can't be
+# replayed by a decorator, so they are opened with SDK retries instead.
 client = OpenAI(api_key=OPENAI_API_KEY)
+async_client = AsyncOpenAI(api_key=OPENAI_API_KEY, max_retries=0)
+streaming_client = async_client.with_options(max_retries=2)
+
+# Maximum number of tool calls executed concurrently per run
+MAX_CONCURRENT_TOOL_CALLS = 8
+
+# Retry transient API errors (rate limits, timeouts, 5xx) up to 3 attempts.
+# APITimeoutError is a subclass of APIConnectionError.
+_retry_transient = retry(
+    stop=stop_after_attempt(3),
+    wait=wait_exponential(multiplier=0.5, max=4),
+    retry=retry_if_exception_type((RateLimitError, APIConnectionError, InternalServerError)),
+    reraise=True
+)
 
 
 # Define function schemas for the agent
@@ -103,8 +124,12 @@ FUNCTION_SCHEMAS = [
 ]
 
 
+# Tools payload for the assistant, built once at import
+_TOOLS = tuple({"type": "function", "function": schema} for schema in FUNCTION_SCHEMAS)
+
+
 # Map function names to actual functions
-FUNCTION_MAP = {
+FUNCTION_MAP: Dict[str, Callable] = {
     "get_property_details": get_property_details,
     "get_comparable_properties": get_comparable_properties,
     "estimate_repair_costs": estimate_repair_costs,
@@ -154,123 +179,205 @@ Output format should be professional and include:
 - ROI and profit potential
 - Clear BUY/PASS recommendation""",
         model="gpt-4o",
-        tools=[{"type": "function", "function": schema} for schema in FUNCTION_SCHEMAS]
+        tools=_TOOLS
     )
 
     return assistant
 
 
-def execute_function_call(function_name: str, arguments: str):
+def get_deal_analyzer_agent():
+    """
+    Load the saved Deal Analyzer Assistant, creating it on first use
+
+    The assistant ID is stored in ASSISTANT_ID_FILE so later runs retrieve
+    the same assistant instead of creating a new one each time.
+
+    Returns:
+        Assistant object
+    """
+    if os.path.exists(ASSISTANT_ID_FILE):
+        with open(ASSISTANT_ID_FILE) as f:
+            assistant_id = f.read().strip()
+
+        if assistant_id:
+            try:
+                return client.beta.assistants.retrieve(assistant_id)
+            except NotFoundError:
+                print(f"⚠️  Saved assistant {assistant_id} no longer exists, creating a new one")
+
+    assistant = create_deal_analyzer_agent()
+
+    with open(ASSISTANT_ID_FILE, "w") as f:
+        f.write(assistant.id)
+
+    return assistant
+
+
+async def execute_function_call(function_name: str, arguments: str, semaphore: asyncio.Semaphore = None):
     """
     Execute a function call from the agent
 
+    Every function runs in a worker thread - the Realtor lookups block on
+    HTTP and the deal calculations are synchronous CPU work - so neither
+    stalls the event loop while other tool calls are in flight.
+
     Args:
         function_name: Name of the function to call
         arguments: JSON string of function arguments
+        semaphore: Optional semaphore bounding concurrent executions
 
     Returns:
         Function result as JSON string
     """
+    function = FUNCTION_MAP.get(function_name)
+
+    if function is None:
+        return orjson.dumps({"error": f"Function {function_name} not found"}).decode()
+
+    # orjson output is compact, which keeps tool outputs (billed as model
+    # input tokens) small
     try:
-        args = json.loads(arguments)
-        function = FUNCTION_MAP.get(function_name)
+        args = orjson.loads(arguments)
+
+        print(f"\n🔧 Executing: {function_name}")
 
-        if not function:
-            return json.dumps({"error": f"Function {function_name} not found"})
+        if semaphore is None:
+            result = await asyncio.to_thread(function, **args)
+        else:
+            async with semaphore:
+                result = await asyncio.to_thread(function, **args)
 
-        result = function(**args)
-        return json.dumps(result)
+        return orjson.dumps(result).decode()
 
     except Exception as e:
-        return json.dumps({"error": str(e)})
+        return orjson.dumps({"error": str(e)}).decode()
 
 
-def run_deal_analysis(assistant_id: str, user_message: str):
+async def execute_tool_calls(tool_calls) -> list:
     """
-    Run a deal analysis conversation with the agent
+    Execute a batch of tool calls concurrently
 
     Args:
-        assistant_id: The assistant ID
-        user_message: User's input (e.g., property address)
+        tool_calls: Tool calls from a run's required_action
 
     Returns:
-        Agent's response
+        List of tool outputs ready to submit, in the same order as tool_calls
     """
-    # Create a thread
-    thread = client.beta.threads.create()
-
-    # Add user message
-    client.beta.threads.messages.create(
-        thread_id=thread.id,
-        role="user",
-        content=user_message
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_TOOL_CALLS)
+
+    outputs = await asyncio.gather(*[
+        execute_function_call(tool_call.function.name, tool_call.function.arguments, semaphore)
+        for tool_call in tool_calls
+    ])
+
+    return [
+        {"tool_call_id": tool_call.id, "output": output}
+        for tool_call, output in zip(tool_calls, outputs)
+    ]
+
+
+@_retry_transient
+async def _create_thread(user_message: str):
+    """Create a thread holding the user message"""
+    return await async_client.beta.threads.create(
+        messages=[{"role": "user", "content": user_message}]
     )
 
-    # Run the assistant
-    run = client.beta.threads.runs.create(
-        thread_id=thread.id,
+
+async def _stream_run(thread_id: str, assistant_id: str):
+    """
+    Run the assistant on a thread, handling function calls as events arrive
+
+    Uses the Assistants streaming interface, so state changes are pushed
+    as they happen instead of being discovered by polling.
+
+    Returns:
+        Text of the latest assistant message, or None if the run did not complete
+    """
+    stream_manager = streaming_client.beta.threads.runs.stream(
+        thread_id=thread_id,
         assistant_id=assistant_id
     )
+    response = None
 
-    # Wait for completion and handle function calls
     while True:
-        run_status = client.beta.threads.runs.retrieve(
-            thread_id=thread.id,
-            run_id=run.id
-        )
+        pending_run = None
+
+        async with stream_manager as stream:
+            async for event in stream:
+                if event.event == "thread.message.completed":
+                    content = event.data.content
+                    if content and content[0].type == "text":
+                        response = content[0].text.value
+
+                elif event.event == "thread.run.requires_action":
+                    pending_run = event.data
 
-        if run_status.status == "completed":
-            break
+                elif event.event == "thread.run.completed":
+                    return response
 
-        elif run_status.status == "requires_action":
-            # Handle function calls
-            tool_outputs = []
+                elif event.event in ["thread.run.failed", "thread.run.cancelled", "thread.run.expired"]:
+                    print(f"❌ Run failed with status: {event.data.status}")
+                    return None
 
-            for tool_call in run_status.required_action.submit_tool_outputs.tool_calls:
-                function_name = tool_call.function.name
-                arguments = tool_call.function.arguments
+        if pending_run is None:
+            # Stream ended without a terminal run event
+            return response
 
-                print(f"\n🔧 Executing: {function_name}")
+        # Handle function calls concurrently, then continue on a new stream
+        tool_outputs = await execute_tool_calls(
+            pending_run.required_action.submit_tool_outputs.tool_calls
+        )
+
+        stream_manager = streaming_client.beta.threads.runs.submit_tool_outputs_stream(
+            thread_id=thread_id,
+            run_id=pending_run.id,
+            tool_outputs=tool_outputs
+        )
+
+
+async def run_deal_analysis(assistant_id: str, user_message: str, timeout: float = ASSISTANT_RUN_TIMEOUT):
+    """
+    Run a deal analysis conversation with the agent
 
-                output = execute_function_call(function_name, arguments)
-                tool_outputs.append({
-                    "tool_call_id": tool_call.id,
-                    "output": output
-                })
+    Args:
+        assistant_id: The assistant ID
+        user_message: User's input (e.g., property address)
+        timeout: Maximum seconds to wait for the run to finish
 
-            # Submit function outputs
-            client.beta.threads.runs.submit_tool_outputs(
-                thread_id=thread.id,
-                run_id=run.id,
-                tool_outputs=tool_outputs
-            )
+    Returns:
+        Agent's response
+    """
+    thread = await _create_thread(user_message)
 
-        elif run_status.status in ["failed", "cancelled", "expired"]:
-            print(f"❌ Run failed with status: {run_status.status}")
-            return None
+    try:
+        return await asyncio.wait_for(_stream_run(thread.id, assistant_id), timeout)
+    except asyncio.TimeoutError:
+        print(f"❌ Run timed out after {timeout} seconds")
+        return None
 
-        # Wait a bit before checking again
-        import time
-        time.sleep(1)
 
-    # Get the assistant's messages
-    messages = client.beta.threads.messages.list(thread_id=thread.id)
+def run_deal_analysis_sync(assistant_id: str, user_message: str, timeout: float = ASSISTANT_RUN_TIMEOUT):
+    """
+    Blocking wrapper around run_deal_analysis for CLI usage
 
-    # Return the latest assistant message
-    for message in messages.data:
-        if message.role == "assistant":
-            return message.content[0].text.value
+    Args:
+        assistant_id: The assistant ID
+        user_message: User's input (e.g., property address)
+        timeout: Maximum seconds to wait for the run to finish
 
-    return None
+    Returns:
+        Agent's response
+    """
+    return asyncio.run(run_deal_analysis(assistant_id, user_message, timeout))
 
 
 if __name__ == "__main__":
-    print("🏠 Creating Real Estate Deal Analyzer Agent...\n")
+    print("🏠 Loading Real Estate Deal Analyzer Agent...\n")
 
-    # Create the assistant
-    assistant = create_deal_analyzer_agent()
-    print(f"✅ Assistant created with ID: {assistant.id}\n")
-    print("📝 Save this ID to reuse the assistant later!\n")
+    # Reuse the saved assistant, or create one on first run
+    assistant = get_deal_analyzer_agent()
+    print(f"✅ Assistant ready with ID: {assistant.id}\n")
 
     # Example usage
     print("="*60)
@@ -286,7 +393,7 @@ if __name__ == "__main__":
     print(f"\n🔍 Analyzing: {property_address}\n")
 
     # Run analysis
-    response = run_deal_analysis(assistant.id, property_address)
+    response = run_deal_analysis_sync(assistant.id, property_address)
 
     if response:
         print("\n" + "="*60)
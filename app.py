@@ -2,57 +2,799 @@
 Flask backend for Real Estate Deal Analyzer with DeepSeek AI
 """
 
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, Response, request, jsonify, send_from_directory, stream_with_context
+from flask.json.provider import DefaultJSONProvider
+from flask_compress import Compress
 from flask_cors import CORS
-import requests
-import json
-from config import RAPIDAPI_KEY, RAPIDAPI_HOST, DEEPSEEK_API_KEY, DEEPSEEK_API_BASE
-from functions.realtor_api import get_property_details, extract_property_info
-from functions.deal_calculator import estimate_repair_costs, analyze_deal
+import hmac
+import httpx
+import orjson
+import pybreaker
+import queue
+import re
+import threading
+import traceback
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import closing
+from config import (
+    RAPIDAPI_KEY,
+    RAPIDAPI_HOST,
+    DEEPSEEK_API_KEY,
+    DEEPSEEK_API_BASE,
+    DEEPSEEK_MAX_CONCURRENT_REQUESTS,
+    DEEPSEEK_STREAM_READ_TIMEOUT,
+    ANALYSIS_PROMPT_MODE,
+    REDIS_URL,
+    LLM_CACHE_TTL,
+    SEMANTIC_CACHE_ENABLED,
+    CACHE_ADMIN_TOKEN,
+    FLASK_DEBUG
+)
+from functions.realtor_api import (
+    get_property_details,
+    get_comparable_properties,
+    extract_property_info,
+    clear_property_cache,
+    property_cache_stats
+)
+from functions.deal_calculator import estimate_repair_costs, analyze_deal, clear_repair_cache
+from functions.http_client import create_client, create_breaker, retry_transient
+from functions.llm_cache import LLMCache
+from functions.semantic_cache import SemanticCache
+
+
+class ORJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson for faster jsonify/request.json"""
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default, option=orjson.OPT_NON_STR_KEYS).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 
 app = Flask(__name__, static_folder='frontend')
+app.json = ORJSONProvider(app)
 CORS(app)
 
+# Compress JSON responses (Brotli, falling back to gzip).
+# text/event-stream is deliberately left out: compressors buffer output,
+# which would hold back streamed analysis chunks.
+app.config['COMPRESS_MIMETYPES'] = ['application/json']
+app.config['COMPRESS_ALGORITHM'] = ['br', 'gzip']
+Compress(app)
+
+# Shared HTTP/2 client so DeepSeek calls reuse one warm TLS connection;
+# base URL and auth header are set once here rather than on every call
+_DEEPSEEK_CLIENT = create_client(
+    base_url=DEEPSEEK_API_BASE,
+    headers={"Authorization": f"Bearer {DEEPSEEK_API_KEY}"}
+)
+
+# Streams fail on no progress rather than on total duration: each read
+# (one chunk, or a keep-alive line while queued) must arrive within the
+# read timeout, so a stalled stream frees its slot quickly while a long
+# healthy one runs to completion. No pool timeout - _DEEPSEEK_SLOTS
+# already bounds how many streams wait for a connection.
+_STREAM_TIMEOUT = httpx.Timeout(connect=3.05, read=DEEPSEEK_STREAM_READ_TIMEOUT, write=3.0, pool=None)
+
+# A batch analysis reply grows with the number of properties, and the
+# whole reply arrives as one read, so its read timeout grows too
+_BATCH_READ_TIMEOUT = 10.0
+_BATCH_READ_TIMEOUT_PER_PROPERTY = 5.0
+
+# Fails DeepSeek calls fast while the API is down
+_DEEPSEEK_BREAKER = create_breaker("DeepSeek")
+
+# Worker threads for overlapping blocking DeepSeek calls within a request
+_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="deepseek")
+
+# Caps in-flight DeepSeek calls across all requests so bursts of users
+# queue briefly here instead of tripping upstream rate limits
+_DEEPSEEK_SLOTS = threading.BoundedSemaphore(DEEPSEEK_MAX_CONCURRENT_REQUESTS)
+
+# Cached DeepSeek responses for deterministic (temperature 0) prompts
+_LLM_CACHE = LLMCache(REDIS_URL, ttl_seconds=LLM_CACHE_TTL)
+
+# Reuses /api/chat answers for similar questions (opt-in, see config)
+_SEMANTIC_CACHE = None
+if SEMANTIC_CACHE_ENABLED:
+    try:
+        _SEMANTIC_CACHE = SemanticCache()
+    except ImportError as e:
+        print(f"⚠️  WARNING: {e}, semantic chat cache disabled")
+
+# In-flight /api/analyze pipelines keyed by normalized message, so
+# concurrent identical requests share a single execution
+_INFLIGHT = {}
+_INFLIGHT_LOCK = threading.Lock()
+
+# Per-property analysis system prompts, selected by config.ANALYSIS_PROMPT_MODE
+_ANALYSIS_PROMPTS = {
+    "brief": "Brief analysis: deal summary, key risks, recommendation. 3 sentences max.",
+    "full": """You are a real estate investment analyst reviewing a fix-and-flip deal.
+Given the list price, ARV, repair estimate, ROI and deal rating, write a concise analysis covering:
+- Market assumptions (neighborhood trends, buyer demand)
+- Repair reasoning (why the estimated rehab level fits)
+- Risk factors (market volatility, competition, cost overruns)
+- Opportunities (appreciation potential, rental fallback)
+- A clear BUY, NEGOTIATE or PASS recommendation
+Keep it under 200 words."""
+}
+
+# System messages, built once and shared by every request (never mutate
+# them). Byte-identical prefixes also let DeepSeek reuse its prompt cache.
+_ANALYSIS_SYSTEM = {
+    "role": "system",
+    "content": _ANALYSIS_PROMPTS[ANALYSIS_PROMPT_MODE]
+}
+
+# Analyzes several properties in one call; the reply is parsed as JSON
+_BATCH_ANALYSIS_SYSTEM = {
+    "role": "system",
+    "content": _ANALYSIS_SYSTEM["content"] + """
+You will receive a JSON array of deals. Analyze each one separately.
+Reply ONLY with a JSON array containing one {"summary": "...", "risks": "...", "recommendation": "..."} object per deal, in the same order."""
+}
+
+_PARSE_SYSTEM = {
+    "role": "system",
+    "content": "Extract: city, state, max_price, count. Reply ONLY in JSON format: {\"city\":\"Austin\",\"state\":\"TX\",\"max_price\":500000,\"count\":3}. If no address found, reply: {\"error\":\"no_location\"}"
+}
 
-def call_deepseek(messages, stream=False):
+_CHAT_SYSTEM = {
+    "role": "system",
+    "content": "You are a helpful real estate investment assistant. Answer questions about real estate investing, property analysis, and market trends."
+}
+
+# Per-property analysis input: only the figures the model needs, one compact line
+_ANALYSIS_TEMPLATE = "${price:,} | ARV: ${arv:,} | Repairs: ${repairs:,} | ROI: {roi}% | Rating: {rating}"
+
+# Matches a full street address such as "123 Main St, Austin, TX 78701".
+# The street must end in a suffix so "2 homes under 300k, Austin, TX"
+# isn't taken for one.
+_ADDRESS_RE = re.compile(
+    r'\b\d+\s+(?:[A-Za-z0-9]+\s+)+?'
+    r'(?i:St|Street|Ave|Avenue|Rd|Road|Dr|Drive|Ln|Lane|Blvd|Boulevard|Ct|Court|Way|Pl|Place|'
+    r'Ter|Terrace|Cir|Circle|Pkwy|Parkway|Hwy|Highway)\.?'
+    r',\s*[A-Za-z][A-Za-z\s]*?,\s*[A-Z]{2}\b(?:\s+\d{5}\b)?'
+)
+
+# Search request pieces: "in San Antonio, TX", "under $300k", "3 deals".
+# The city must open the message or follow "in", and may only contain
+# plain capitalized words - "St. Louis" or "Winston-Salem" don't match
+# and are left to DeepSeek. A city opening the message may carry a verb
+# with it ("Find Austin, TX"), so only an "in" match is trusted on its own.
+_CITY_STATE_RE = re.compile(r'(?:^|\b(?P<via_in>[Ii][Nn])\s+)(?P<city>(?!In\b)[A-Z][a-z]+(?:\s+(?!In\b)[A-Z][a-z]+)*),\s*(?P<state>[A-Z]{2})\b')
+_PRICE_RE = re.compile(r'\b(?:under|below|less than|up to|max)\s*\$?(\d[\d,]*(?:\.\d+)?)\s*(k|m)?\b', re.IGNORECASE)
+# Price floors and ranges, which the local parser can't express
+_PRICE_FLOOR_RE = re.compile(r'\b(?:over|above|more than|at least|no less than|between|min|minimum|starting at)\b', re.IGNORECASE)
+# A limit below this without a k/m suffix is probably not a price ("max 5 properties")
+_MIN_PLAUSIBLE_PRICE = 10000
+_COUNT_RE = re.compile(r'\b(\d+)\s+(?:deals?|properties|homes?|houses?|listings?)\b', re.IGNORECASE)
+
+
+@_DEEPSEEK_BREAKER
+@retry_transient
+def _post_deepseek(payload):
+    """POST a chat completion request, retrying transient failures"""
+    response = _DEEPSEEK_CLIENT.post("/chat/completions", json=payload)
+    response.raise_for_status()
+    return orjson.loads(response.content)
+
+
+@_DEEPSEEK_BREAKER
+def _post_deepseek_once(payload, timeout):
+    """POST a chat completion request with a custom timeout and no retries"""
+    response = _DEEPSEEK_CLIENT.post("/chat/completions", json=payload, timeout=timeout)
+    response.raise_for_status()
+    return orjson.loads(response.content)
+
+
+@_DEEPSEEK_BREAKER
+@retry_transient
+def _open_deepseek_stream(payload):
+    """
+    Start a streaming chat completion request, retrying transient failures
+
+    Opening the stream goes through the circuit breaker like any other
+    call, so an open circuit lets a trial stream through (half-open)
+    once its reset timeout passes. Errors after the stream is open aren't
+    counted.
+
+    Returns:
+        httpx.Response with the body still unread; the caller closes it
+    """
+    response = _DEEPSEEK_CLIENT.send(
+        _DEEPSEEK_CLIENT.build_request("POST", "/chat/completions", json=payload, timeout=_STREAM_TIMEOUT),
+        stream=True
+    )
+
+    try:
+        response.raise_for_status()
+    except httpx.HTTPStatusError:
+        response.close()
+        raise
+
+    return response
+
+
+def call_deepseek(messages, stream=False, temperature=0.7):
     """
     Call DeepSeek API for AI analysis
 
     Args:
         messages: List of message objects with role and content
         stream: Whether to stream the response
+        temperature: Sampling temperature; 0 makes the response deterministic
+            and therefore cacheable
 
     Returns:
         AI response text
     """
-    headers = {
-        "Authorization": f"Bearer {DEEPSEEK_API_KEY}",
-        "Content-Type": "application/json"
-    }
+    return call_deepseek_with_status(messages, stream, temperature)[0]
+
+
+def call_deepseek_with_status(messages, stream=False, temperature=0.7, timeout=None):
+    """
+    call_deepseek that also reports how the response cache was used
+
+    Only successful responses are cached; error messages never are.
+
+    Args:
+        timeout: Optional httpx timeout for this call; when given, the call
+            isn't retried, for callers that have their own fallback
 
+    Returns:
+        Tuple of (AI response text, cache status): "HIT", "MISS", None if
+        the request isn't cacheable, or "ERROR" if the text is an error
+        message
+    """
     payload = {
         "model": "deepseek-chat",
         "messages": messages,
         "stream": stream,
-        "temperature": 0.7
+        "temperature": temperature
     }
 
+    cache_key = None
+    if not stream:
+        cache_key = _LLM_CACHE.cache_key(payload["model"], messages, temperature)
+
+    if cache_key:
+        cached = _LLM_CACHE.get(cache_key)
+        if cached is not None:
+            return cached, "HIT"
+
+    cache_status = "MISS" if cache_key else None
+
     try:
-        response = requests.post(
-            f"{DEEPSEEK_API_BASE}/chat/completions",
-            headers=headers,
-            json=payload,
-            timeout=15  # 15 second timeout
-        )
-        response.raise_for_status()
+        with _DEEPSEEK_SLOTS:
+            if timeout is None:
+                result = _post_deepseek(payload)
+            else:
+                result = _post_deepseek_once(payload, timeout)
+
+        content = result['choices'][0]['message']['content']
+        log_prompt_cache_usage(result.get('usage'))
+
+        if cache_key:
+            _LLM_CACHE.set(cache_key, content)
 
-        result = response.json()
-        return result['choices'][0]['message']['content']
+        return content, cache_status
 
-    except requests.Timeout:
+    except Exception as e:
+        return deepseek_error_message(e), "ERROR"
+
+
+def deepseek_error_message(error):
+    """User-facing text for a failed DeepSeek call"""
+    if isinstance(error, pybreaker.CircuitBreakerError):
+        return "DeepSeek API temporarily unavailable - please try again shortly"
+    if isinstance(error, httpx.TimeoutException):
         return "DeepSeek API timeout - please try again"
+    return f"Error calling DeepSeek API: {str(error)}"
+
+
+def log_prompt_cache_usage(usage):
+    """
+    Log how much of a prompt DeepSeek served from its prefix cache
+
+    DeepSeek caches shared prompt prefixes automatically (in 64-token
+    units, no minimum length) and bills cache hits at a fraction of the
+    normal input price, so the stable system messages above should show
+    up here as hits on repeat calls.
+    """
+    if not usage or "prompt_cache_hit_tokens" not in usage:
+        return
+
+    print(f"DeepSeek prompt cache: {usage['prompt_cache_hit_tokens']}/{usage.get('prompt_tokens', 0)} prompt tokens hit")
+
+
+def stream_deepseek(messages, temperature=0.7, raise_errors=False):
+    """
+    Stream a DeepSeek completion as it is generated
+
+    A cached response is yielded as a single chunk; a fully streamed
+    response is written to the cache once it completes.
+
+    Args:
+        messages: List of message objects with role and content
+        temperature: Sampling temperature; 0 makes the response cacheable
+        raise_errors: Raise on failure instead of yielding an error
+            message as the last chunk
+
+    Yields:
+        Chunks of AI response text
+    """
+    payload = {
+        "model": "deepseek-chat",
+        "messages": messages,
+        "stream": True,
+        "temperature": temperature,
+        "stream_options": {"include_usage": True}
+    }
+
+    cache_key = _LLM_CACHE.cache_key(payload["model"], messages, temperature)
+    if cache_key:
+        cached = _LLM_CACHE.get(cache_key)
+        if cached is not None:
+            yield cached
+            return
+
+    try:
+        with _DEEPSEEK_SLOTS, closing(_open_deepseek_stream(payload)) as response:
+            parts = []
+
+            # Server-sent events: "data: {...}" lines, ending with "data: [DONE]"
+            for line in response.iter_lines():
+                if not line.startswith("data: "):
+                    continue
+
+                data = line[len("data: "):]
+                if data == "[DONE]":
+                    break
+
+                chunk = orjson.loads(data)
+
+                # The usage summary arrives in a final chunk with no choices
+                if chunk.get('usage'):
+                    log_prompt_cache_usage(chunk['usage'])
+                if not chunk.get('choices'):
+                    continue
+
+                content = chunk['choices'][0]['delta'].get('content')
+                if content:
+                    parts.append(content)
+                    yield content
+
+            if cache_key:
+                _LLM_CACHE.set(cache_key, "".join(parts))
+
     except Exception as e:
-        return f"Error calling DeepSeek API: {str(e)}"
+        if raise_errors:
+            raise
+        yield deepseek_error_message(e)
+
+
+def parse_search_query(user_message):
+    """
+    Parse a search request like "3 deals in Dallas, TX under 300k" locally
+
+    Args:
+        user_message: Search request from the user
+
+    Returns:
+        Dictionary with city, state, max_price, count and complete (True
+        only when the city followed "in" and a single unambiguous price
+        ceiling was found, so nothing was left to guess), or None if no
+        city/state pair was found
+    """
+    location = _CITY_STATE_RE.search(user_message)
+    if not location:
+        return None
+
+    max_price = 1000000
+    complete = False
+
+    ceilings = _PRICE_RE.findall(user_message)
+    if len(ceilings) == 1:
+        amount, suffix = ceilings[0]
+        multiplier = {'k': 1000, 'm': 1000000}.get(suffix.lower(), 1)
+        value = int(float(amount.replace(',', '')) * multiplier)
+
+        if suffix or value >= _MIN_PLAUSIBLE_PRICE:
+            max_price = value
+            # "over 500k", "between 200k and 400k" etc. need DeepSeek
+            complete = bool(location.group("via_in")) and not _PRICE_FLOOR_RE.search(user_message)
+
+    count = 1
+    count_match = _COUNT_RE.search(user_message)
+    if count_match:
+        count = int(count_match.group(1))
+
+    return {
+        "city": location.group("city"),
+        "state": location.group("state"),
+        "max_price": max_price,
+        "count": min(count, 3),  # Max 3 properties
+        "complete": complete
+    }
+
+
+def find_properties(user_message):
+    """
+    Resolve a user message to raw properties from the Realtor API
+
+    Args:
+        user_message: Address or search request from the user
+
+    Returns:
+        Tuple of (properties, query description, error message, Realtor
+        cache status "HIT"/"MISS"); properties is None when the error
+        message is set
+    """
+    # Fast path: a full street address needs no DeepSeek parse round-trip.
+    # A count ("3 deals at ...") means a search, so that goes the long way.
+    address_match = _ADDRESS_RE.search(user_message)
+    if address_match and not _COUNT_RE.search(user_message):
+        address = address_match.group(0)
+        print(f"Fetching property at {address}")
+
+        details = get_property_details(address)
+        if not details.get('success'):
+            return None, None, f"Could not find property at {address}", None
+
+        # Only label the result as the address if the listing really is there
+        query = address
+        if not details.get('exact_match'):
+            query = f"Newest listing near {address.split(',', 1)[1].strip()}"
+
+        return [details['property']], query, None, "HIT" if details.get('cached') else "MISS"
+
+    guess = parse_search_query(user_message)
+
+    # Fast path: location and price both parsed locally, so the DeepSeek
+    # parse round-trip is skipped entirely
+    if guess and guess["complete"]:
+        city, state, max_price, count = guess["city"], guess["state"], guess["max_price"], guess["count"]
+        print(f"Fetching {count} properties in {city}, {state} under ${max_price}")
+
+        comps_result = get_comparable_properties(city, state, max_price, limit=count)
+        return search_result(comps_result, city, state, max_price, count)
+
+    # Otherwise speculatively start the Realtor search from the partial
+    # local parse while DeepSeek parses the request; kept only if both
+    # parses agree
+    prefetch = None
+    if guess:
+        prefetch = _EXECUTOR.submit(
+            get_comparable_properties, guess["city"], guess["state"], guess["max_price"], limit=guess["count"]
+        )
+
+    # Step 1: Use DeepSeek to parse the request
+    parse_prompt = [
+        _PARSE_SYSTEM,
+        {
+            "role": "user",
+            "content": user_message
+        }
+    ]
+
+    parsed = call_deepseek(parse_prompt).strip()
+
+    # Try to parse JSON response
+    try:
+        query_params = orjson.loads(parsed)
+    except orjson.JSONDecodeError:
+        # If JSON parsing fails, return error
+        return None, None, "Please specify a city and state (e.g., 'Austin, TX' or 'properties in Dallas, TX under 300k')", None
+
+    if query_params.get("error"):
+        return None, None, "Please specify a city and state (e.g., 'Austin, TX' or '3 deals in Miami, FL under 500k')", None
+
+    # Step 2: Fetch properties from Realtor API
+    city = query_params.get("city", "")
+    state = query_params.get("state", "")
+    max_price = query_params.get("max_price", 1000000)
+    count = min(query_params.get("count", 1), 3)  # Max 3 properties
+
+    if prefetch is not None and (
+        city.lower() == guess["city"].lower()
+        and state.upper() == guess["state"]
+        and max_price == guess["max_price"]
+        and count == guess["count"]
+    ):
+        comps_result = prefetch.result()
+    else:
+        if prefetch is not None:
+            prefetch.cancel()  # Only stops it if it hasn't started yet
+
+        print(f"Fetching {count} properties in {city}, {state} under ${max_price}")
+
+        comps_result = get_comparable_properties(city, state, max_price, limit=count)
+
+    return search_result(comps_result, city, state, max_price, count)
+
+
+def search_result(comps_result, city, state, max_price, count):
+    """find_properties return value for a Realtor search result"""
+    if not comps_result.get('success'):
+        return None, None, f"Could not find properties in {city}, {state}", None
+
+    query = f"{count} properties in {city}, {state} under ${max_price:,}"
+    return comps_result['comparables'], query, None, "HIT" if comps_result.get('cached') else "MISS"
+
+
+def prepare_properties(raw_properties):
+    """
+    Run the deal math for each raw property
+
+    Args:
+        raw_properties: List of raw property data from the Realtor API
+
+    Returns:
+        List of (result dictionary without AI analysis, AI analysis prompt)
+        tuples, one per property
+    """
+    prepared = []
+
+    for raw_property in raw_properties:
+        property_info = extract_property_info(raw_property)
+        repair_estimate = estimate_repair_costs(property_info)
+        deal_analysis = analyze_deal(property_info, repair_costs=repair_estimate['estimated_total'])
+        prepared.append(_prepare_result(property_info, repair_estimate, deal_analysis))
+
+    return prepared
+
+
+def _prepare_result(property_info, repair_estimate, deal_analysis):
+    """Result dictionary and AI analysis prompt for one analyzed property"""
+    analysis_prompt = [
+        _ANALYSIS_SYSTEM,
+        {
+            "role": "user",
+            "content": _ANALYSIS_TEMPLATE.format(
+                price=property_info.get('price'),
+                arv=deal_analysis.get('arv'),
+                repairs=deal_analysis.get('estimated_repairs'),
+                roi=deal_analysis.get('roi_percentage'),
+                rating=deal_analysis.get('deal_rating')
+            )
+        }
+    ]
+
+    # The listing description isn't used by the deal math or the frontend
+    property_data = {key: value for key, value in property_info.items() if key != "description_text"}
+
+    result = {
+        "property_data": property_data,
+        "deal_analysis": deal_analysis,
+        "repair_estimate": repair_estimate
+    }
+
+    return result, analysis_prompt
+
+
+def analyze_properties(properties):
+    """
+    Run deal math and a short AI analysis for each raw property
+
+    The deal math is computed up front. Several properties are analyzed
+    in a single DeepSeek call (system prompt sent once); if that reply
+    can't be parsed, per-property calls run concurrently instead, so
+    total latency stays at about one round-trip either way.
+
+    Args:
+        properties: List of raw property data from the Realtor API
+
+    Returns:
+        Tuple of (list of result dictionaries for the frontend, cache
+        status: "HIT" if every analysis came from the response cache,
+        otherwise "MISS")
+    """
+    prepared = prepare_properties(properties)
+
+    analyses = None
+    if len(prepared) > 1:
+        analyses = batch_analyses([result for result, _ in prepared])
+
+    if analyses is None:
+        analyses = _EXECUTOR.map(
+            lambda analysis_prompt: call_deepseek_with_status(analysis_prompt, temperature=0),
+            [analysis_prompt for _, analysis_prompt in prepared]
+        )
+
+    results = []
+    all_hits = True
+
+    for (result, _), (ai_analysis, cache_status) in zip(prepared, analyses):
+        result["ai_analysis"] = ai_analysis
+        results.append(result)
+        all_hits = all_hits and cache_status == "HIT"
+
+    return results, "HIT" if all_hits else "MISS"
+
+
+def batch_analyses(results):
+    """
+    Analyze several prepared properties with one DeepSeek call
+
+    The read timeout scales with the number of properties, and the call
+    isn't retried - on any failure the caller falls back to one call per
+    property, which is cheaper than retrying the whole batch.
+
+    Args:
+        results: Result dictionaries from prepare_properties
+
+    Returns:
+        List of (AI analysis text, cache status) tuples in the same order
+        as results, or None if the call failed or the reply wasn't a JSON
+        array with one object per property
+    """
+    deals = [
+        {
+            "price": result["property_data"].get("price"),
+            "arv": result["deal_analysis"].get("arv"),
+            "repairs": result["deal_analysis"].get("estimated_repairs"),
+            "roi": result["deal_analysis"].get("roi_percentage"),
+            "rating": result["deal_analysis"].get("deal_rating")
+        }
+        for result in results
+    ]
+
+    reply, cache_status = call_deepseek_with_status([
+        _BATCH_ANALYSIS_SYSTEM,
+        {
+            "role": "user",
+            "content": orjson.dumps(deals).decode()
+        }
+    ], temperature=0, timeout=httpx.Timeout(
+        _BATCH_READ_TIMEOUT + _BATCH_READ_TIMEOUT_PER_PROPERTY * len(results), connect=3.05
+    ))
+
+    if cache_status == "ERROR":
+        print(f"Batch analysis failed ({reply}), analyzing properties one by one")
+        return None
+
+    # Models sometimes wrap JSON in a ```json fence
+    reply = reply.strip().removeprefix("```json").removeprefix("```").removesuffix("```")
+
+    try:
+        items = orjson.loads(reply)
+    except orjson.JSONDecodeError:
+        print("Batch analysis reply was not valid JSON, analyzing properties one by one")
+        return None
+
+    if not isinstance(items, list) or len(items) != len(results) or not all(isinstance(item, dict) for item in items):
+        print("Batch analysis reply did not match the properties, analyzing properties one by one")
+        return None
+
+    return [
+        (
+            f"{item.get('summary', '')}\nRisks: {item.get('risks', '')}\nRecommendation: {item.get('recommendation', '')}",
+            cache_status
+        )
+        for item in items
+    ]
+
+
+def stream_analyses(prompts):
+    """
+    Stream several DeepSeek analyses concurrently
+
+    Each prompt streams on its own worker thread; chunks are merged in
+    arrival order so the first tokens of every analysis show up after
+    about one round-trip. If the consumer goes away, queued workers are
+    cancelled and running ones stop at their next chunk.
+
+    Args:
+        prompts: List of message lists, one per analysis
+
+    Yields:
+        (index, text chunk) tuples, index being the prompt's position
+    """
+    chunks = queue.Queue()
+    stopped = threading.Event()
+
+    def stream_one(index, prompt):
+        try:
+            # Queued behind other requests until after the consumer left
+            if stopped.is_set():
+                return
+            with closing(stream_deepseek(prompt, temperature=0)) as stream:
+                for chunk in stream:
+                    if stopped.is_set():
+                        break
+                    chunks.put((index, chunk))
+        finally:
+            chunks.put((index, None))  # Marks this analysis as finished
+
+    futures = [_EXECUTOR.submit(stream_one, index, prompt) for index, prompt in enumerate(prompts)]
+
+    try:
+        remaining = len(prompts)
+        while remaining:
+            index, chunk = chunks.get()
+            if chunk is None:
+                remaining -= 1
+            else:
+                yield index, chunk
+    finally:
+        stopped.set()
+        for future in futures:
+            future.cancel()
+
+
+def run_analysis(user_message):
+    """
+    Full analysis pipeline behind /api/analyze
+
+    Args:
+        user_message: Address or search request from the user
+
+    Returns:
+        Tuple of (response payload dictionary, cache status headers)
+    """
+    properties, query, error, realtor_cache = find_properties(user_message)
+
+    if error:
+        return {
+            "type": "error",
+            "message": error
+        }, {}
+
+    # Step 3: Analyze each property
+    results, cache_status = analyze_properties(properties)
+
+    return {
+        "type": "analysis",
+        "properties": results,
+        "count": len(results),
+        "query": query
+    }, {"X-Cache": cache_status, "X-Realtor-Cache": realtor_cache}
+
+
+def single_flight(key, function, *args):
+    """
+    Run function once for all concurrent callers using the same key
+
+    The first caller executes; callers arriving while it runs wait for
+    and share its result (or exception).
+
+    Args:
+        key: Deduplication key
+        function: Function to run
+        *args: Arguments for function
+
+    Returns:
+        The function's result
+    """
+    with _INFLIGHT_LOCK:
+        future = _INFLIGHT.get(key)
+        is_leader = future is None
+        if is_leader:
+            future = Future()
+            _INFLIGHT[key] = future
+
+    if not is_leader:
+        return future.result()
+
+    try:
+        result = function(*args)
+        future.set_result(result)
+        return result
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _INFLIGHT_LOCK:
+            del _INFLIGHT[key]
+
+
+def sse_event(event, data):
+    """Format a server-sent event with a JSON payload"""
+    return f"event: {event}\ndata: {orjson.dumps(data).decode()}\n\n"
 
 
 @app.route('/')
@@ -80,99 +822,68 @@ def analyze_property():
         return jsonify({"error": "No message provided"}), 400
 
     try:
-        # Step 1: Use DeepSeek to parse the request
-        parse_prompt = [
-            {
-                "role": "system",
-                "content": "Extract: city, state, max_price, count. Reply ONLY in JSON format: {\"city\":\"Austin\",\"state\":\"TX\",\"max_price\":500000,\"count\":3}. If no address found, reply: {\"error\":\"no_location\"}"
-            },
-            {
-                "role": "user",
-                "content": user_message
-            }
-        ]
+        # Identical messages already being analyzed share that result
+        key = " ".join(user_message.lower().split())
+        payload, cache_headers = single_flight(key, run_analysis, user_message)
 
-        parsed = call_deepseek(parse_prompt).strip()
+        response = jsonify(payload)
+        response.headers.update(cache_headers)
+        return response
 
-        # Try to parse JSON response
-        try:
-            query_params = json.loads(parsed)
-        except:
-            # If JSON parsing fails, return error
-            return jsonify({
-                "type": "error",
-                "message": "Please specify a city and state (e.g., 'Austin, TX' or 'properties in Dallas, TX under 300k')"
-            })
+    except Exception as e:
+        print(f"Error: {str(e)}")
+        print(traceback.format_exc())
+        return jsonify({
+            "type": "error",
+            "message": f"Server error: {str(e)}"
+        }), 200  # Return 200 so frontend gets JSON
 
-        if query_params.get("error"):
-            return jsonify({
-                "type": "error",
-                "message": "Please specify a city and state (e.g., 'Austin, TX' or '3 deals in Miami, FL under 500k')"
-            })
 
-        # Step 2: Fetch properties from Realtor API
-        city = query_params.get("city", "")
-        state = query_params.get("state", "")
-        max_price = query_params.get("max_price", 1000000)
-        count = min(query_params.get("count", 1), 3)  # Max 3 properties
+@app.route('/api/analyze/stream', methods=['GET'])
+def analyze_property_stream():
+    """
+    Streaming variant of /api/analyze using server-sent events
 
-        print(f"Fetching {count} properties in {city}, {state} under ${max_price}")
+    Emits a "properties" event with the deal math as soon as it is ready,
+    then "analysis" events carrying AI text chunks tagged by property index
+    (properties stream concurrently, so indexes interleave), then "done"
+    (or a single "error" event).
+    """
+    user_message = request.args.get('message', '')
 
-        from functions.realtor_api import get_comparable_properties
-        comps_result = get_comparable_properties(city, state, max_price, limit=count)
+    if not user_message:
+        return jsonify({"error": "No message provided"}), 400
 
-        if not comps_result.get('success'):
-            return jsonify({
-                "type": "error",
-                "message": f"Could not find properties in {city}, {state}"
-            })
+    def generate():
+        try:
+            properties, query, error, _ = find_properties(user_message)
+
+            if error:
+                yield sse_event("error", {"message": error})
+                return
 
-        # Step 3: Analyze each property
-        properties = comps_result['comparables']
-        results = []
-
-        for raw_property in properties:
-            property_info = extract_property_info(raw_property)
-            repair_estimate = estimate_repair_costs(property_info)
-            deal_analysis = analyze_deal(property_info, repair_costs=repair_estimate['estimated_total'])
-
-            # Quick AI analysis for each
-            analysis_prompt = [
-                {
-                    "role": "system",
-                    "content": "Brief analysis: deal summary, key risks, recommendation. 3 sentences max."
-                },
-                {
-                    "role": "user",
-                    "content": f"${property_info.get('price'):,} | ARV: ${deal_analysis.get('arv'):,} | Repairs: ${deal_analysis.get('estimated_repairs'):,} | ROI: {deal_analysis.get('roi_percentage')}% | Rating: {deal_analysis.get('deal_rating')}"
-                }
-            ]
-
-            ai_analysis = call_deepseek(analysis_prompt)
-
-            results.append({
-                "property_data": property_info,
-                "deal_analysis": deal_analysis,
-                "repair_estimate": repair_estimate,
-                "ai_analysis": ai_analysis
+            prepared = prepare_properties(properties)
+
+            yield sse_event("properties", {
+                "properties": [result for result, _ in prepared],
+                "count": len(prepared),
+                "query": query
             })
 
-        # Return all results
-        return jsonify({
-            "type": "analysis",
-            "properties": results,
-            "count": len(results),
-            "query": f"{count} properties in {city}, {state} under ${max_price:,}"
-        })
+            for index, chunk in stream_analyses([analysis_prompt for _, analysis_prompt in prepared]):
+                yield sse_event("analysis", {"index": index, "text": chunk})
 
-    except Exception as e:
-        import traceback
-        print(f"Error: {str(e)}")
-        print(traceback.format_exc())
-        return jsonify({
-            "type": "error",
-            "message": f"Server error: {str(e)}"
-        }), 200  # Return 200 so frontend gets JSON
+            yield sse_event("done", {})
+
+        except Exception as e:
+            print(f"Error: {str(e)}")
+            print(traceback.format_exc())
+            yield sse_event("error", {"message": f"Server error: {str(e)}"})
+
+    return Response(stream_with_context(generate()), mimetype='text/event-stream', headers={
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no"  # Disable proxy buffering (nginx)
+    })
 
 
 @app.route('/api/chat', methods=['POST'])
@@ -187,21 +898,36 @@ def chat():
         return jsonify({"error": "No message provided"}), 400
 
     try:
-        response = call_deepseek([
-            {
-                "role": "system",
-                "content": "You are a helpful real estate investment assistant. Answer questions about real estate investing, property analysis, and market trends."
-            },
+        cached, question_vector = None, None
+        if _SEMANTIC_CACHE is not None:
+            cached, question_vector = _SEMANTIC_CACHE.get(user_message)
+
+        if cached is not None:
+            response = jsonify({
+                "type": "chat",
+                "message": cached
+            })
+            response.headers["X-Cache"] = "SEMANTIC_HIT"
+            return response
+
+        answer, status = call_deepseek_with_status([
+            _CHAT_SYSTEM,
             {
                 "role": "user",
                 "content": user_message
             }
         ])
 
-        return jsonify({
+        if _SEMANTIC_CACHE is not None and status != "ERROR":
+            _SEMANTIC_CACHE.put(question_vector, answer)
+
+        response = jsonify({
             "type": "chat",
-            "message": response
+            "message": answer
         })
+        if _SEMANTIC_CACHE is not None:
+            response.headers["X-Cache"] = "MISS"
+        return response
 
     except Exception as e:
         return jsonify({
@@ -210,6 +936,105 @@ def chat():
         }), 500
 
 
+@app.route('/api/chat/stream', methods=['GET'])
+def chat_stream():
+    """
+    Streaming variant of /api/chat using server-sent events
+
+    Emits "message" events carrying AI text chunks, then "done" (or a
+    single "error" event). Answers in the semantic cache are sent as one
+    chunk, and completed streams are added to it. API-only - the bundled
+    frontend doesn't use the chat endpoints.
+    """
+    user_message = request.args.get('message', '')
+
+    if not user_message:
+        return jsonify({"error": "No message provided"}), 400
+
+    def generate():
+        try:
+            cached, question_vector = None, None
+            if _SEMANTIC_CACHE is not None:
+                cached, question_vector = _SEMANTIC_CACHE.get(user_message)
+
+            if cached is not None:
+                yield sse_event("message", {"text": cached})
+            else:
+                messages = [
+                    _CHAT_SYSTEM,
+                    {
+                        "role": "user",
+                        "content": user_message
+                    }
+                ]
+
+                # closing() releases the upstream stream as soon as the
+                # client disconnects and this generator is closed
+                parts = []
+                with closing(stream_deepseek(messages, raise_errors=True)) as stream:
+                    for chunk in stream:
+                        parts.append(chunk)
+                        yield sse_event("message", {"text": chunk})
+
+                # Only answers that streamed to the end are reused
+                if _SEMANTIC_CACHE is not None:
+                    _SEMANTIC_CACHE.put(question_vector, "".join(parts))
+
+            yield sse_event("done", {})
+
+        except (pybreaker.CircuitBreakerError, httpx.HTTPError) as e:
+            yield sse_event("error", {"message": deepseek_error_message(e)})
+        except Exception as e:
+            print(f"Error: {str(e)}")
+            print(traceback.format_exc())
+            yield sse_event("error", {"message": f"Error: {str(e)}"})
+
+    return Response(stream_with_context(generate()), mimetype='text/event-stream', headers={
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no"  # Disable proxy buffering (nginx)
+    })
+
+
+@app.route('/api/cache/clear', methods=['POST'])
+def clear_cache():
+    """
+    Clear cached Realtor responses, repair estimates and AI responses
+
+    Requires the CACHE_ADMIN_TOKEN secret in the X-Admin-Token header;
+    with Redis, a clear affects every worker.
+    """
+    token = request.headers.get("X-Admin-Token", "")
+    if not CACHE_ADMIN_TOKEN or not hmac.compare_digest(token.encode(), CACHE_ADMIN_TOKEN.encode()):
+        return jsonify({
+            "type": "error",
+            "message": "Not authorized to clear the cache"
+        }), 403
+
+    clear_property_cache()
+    clear_repair_cache()
+    _LLM_CACHE.clear()
+    if _SEMANTIC_CACHE is not None:
+        _SEMANTIC_CACHE.clear()
+
+    return jsonify({
+        "type": "cache",
+        "message": "Cache cleared"
+    })
+
+
+@app.route('/api/cache/stats', methods=['GET'])
+def cache_stats():
+    """
+    Response cache hit/miss counts for this process
+    """
+    return jsonify({
+        "type": "cache",
+        "realtor": property_cache_stats(),
+        "llm": _LLM_CACHE.stats,
+        "semantic": _SEMANTIC_CACHE.stats if _SEMANTIC_CACHE is not None else None
+    })
+
+
 if __name__ == '__main__':
     print("\n" + "="*60)
     print("🏠 Real Estate Deal Analyzer - Starting Server")
@@ -219,4 +1044,5 @@ if __name__ == '__main__':
     print("\n🌐 Open your browser to: http://localhost:5000")
     print("="*60 + "\n")
 
-    app.run(debug=True, port=5000)
+    # Development server only - use gunicorn in production (see gunicorn.conf.py)
+    app.run(debug=FLASK_DEBUG, port=5000)
@@ -5,9 +5,14 @@ Configuration file for Deal Analyzer Agent
 import os
 from dotenv import load_dotenv
 
-# Load .env only if it exists (local development)
-if os.path.exists('.env'):
-    load_dotenv()
+# Load .env only if it exists (local development). Processes spawned
+# after this runs, such as the Flask reloader child, inherit the flag and
+# skip the file. Gunicorn workers don't: without preload_app the master
+# never imports config, so each worker loads .env itself.
+if not os.getenv("_ENV_LOADED"):
+    if os.path.exists('.env'):
+        load_dotenv()
+    os.environ["_ENV_LOADED"] = "1"
 
 # API Keys
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
@@ -23,9 +28,40 @@ if not DEEPSEEK_API_KEY:
 # RapidAPI Realtor Config
 RAPIDAPI_HOST = "realty-in-us.p.rapidapi.com"
 RAPIDAPI_BASE_URL = f"https://{RAPIDAPI_HOST}"
+DEBUG_RAW = bool(os.getenv("DEBUG_RAW"))  # include full API responses as raw_data
 
 # DeepSeek API Config
 DEEPSEEK_API_BASE = "https://api.deepseek.com/v1"
+DEEPSEEK_MAX_CONCURRENT_REQUESTS = 8  # per process, shared by all requests
+# Seconds a stream may go without data before it is abandoned
+DEEPSEEK_STREAM_READ_TIMEOUT = float(os.getenv("DEEPSEEK_STREAM_READ_TIMEOUT", "3.0"))
+
+# Per-property AI analysis: 'brief' (3 sentences) or 'full' (detailed write-up)
+ANALYSIS_PROMPT_MODE = os.getenv("ANALYSIS_PROMPT_MODE", "brief")
+if ANALYSIS_PROMPT_MODE not in ("brief", "full"):
+    print(f"⚠️  WARNING: Unknown ANALYSIS_PROMPT_MODE '{ANALYSIS_PROMPT_MODE}', using 'brief'")
+    ANALYSIS_PROMPT_MODE = "brief"
+
+# Response cache: Redis when REDIS_URL is set, otherwise in-process memory
+REDIS_URL = os.getenv("REDIS_URL", "")
+LLM_CACHE_TTL = 14400  # seconds (4 hours)
+REALTOR_CACHE_TTL = 900  # seconds (15 minutes)
+
+# Shared secret for POST /api/cache/clear (sent as X-Admin-Token);
+# the endpoint is disabled while this is unset
+CACHE_ADMIN_TOKEN = os.getenv("CACHE_ADMIN_TOKEN", "")
+
+# Reuse /api/chat answers for semantically similar questions
+# (needs the optional sentence-transformers package)
+SEMANTIC_CACHE_ENABLED = os.getenv("SEMANTIC_CACHE_ENABLED", "false").lower() == "true"
+
+# OpenAI Assistants Config
+ASSISTANT_RUN_TIMEOUT = 120  # seconds to wait for a run to finish
+# Saved assistant ID, reused across runs (delete the file to recreate the assistant)
+ASSISTANT_ID_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".assistant_id")
+
+# Development server debug mode (python app.py); never enable in production
+FLASK_DEBUG = os.getenv("FLASK_DEBUG", "0") == "1"
 
 # Investment Analysis Defaults
 DEFAULT_HOLDING_PERIOD = 6  # months
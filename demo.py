@@ -2,7 +2,7 @@
 Simple demo interface for Real Estate Deal Analyzer Agent
 """
 
-from agent import create_deal_analyzer_agent, run_deal_analysis
+from agent import get_deal_analyzer_agent, run_deal_analysis_sync
 import sys
 
 
@@ -16,9 +16,8 @@ def main():
     # Create or load assistant
     print("🔧 Initializing AI Agent...")
 
-    # You can save the assistant_id and reuse it
-    # For demo, we create a new one each time
-    assistant = create_deal_analyzer_agent()
+    # Reuses the assistant saved in .assistant_id, creating one on first run
+    assistant = get_deal_analyzer_agent()
     assistant_id = assistant.id
 
     print(f"✅ Agent ready! (ID: {assistant_id})\n")
@@ -46,7 +45,7 @@ def main():
         print("⏳ This may take 10-30 seconds...\n")
 
         # Run the analysis
-        response = run_deal_analysis(assistant_id, user_input)
+        response = run_deal_analysis_sync(assistant_id, user_input)
 
         if response:
             print("\n" + "="*60)
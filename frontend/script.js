@@ -42,44 +42,11 @@ async function sendMessage() {
     setLoading(true);
 
     try {
-        // Call API - use relative URL so it works on any deployment
-        const response = await fetch('/api/analyze', {
-            method: 'POST',
-            headers: {
-                'Content-Type': 'application/json',
-            },
-            body: JSON.stringify({ message: message })
-        });
-
-        const data = await response.json();
-
-        // Handle different response types
-        if (data.type === 'analysis') {
-            // Check if multiple properties
-            if (data.properties && data.properties.length > 0) {
-                // Multiple properties
-                addMessage(`Found ${data.count} properties:`, 'assistant');
-                data.properties.forEach((prop, index) => {
-                    displayPropertyAnalysis({
-                        property_data: prop.property_data,
-                        deal_analysis: prop.deal_analysis,
-                        repair_estimate: prop.repair_estimate,
-                        ai_analysis: prop.ai_analysis,
-                        address: prop.property_data.address
-                    });
-                });
-            } else {
-                // Single property (old format)
-                displayPropertyAnalysis(data);
-            }
-        } else if (data.type === 'conversation' || data.type === 'chat') {
-            // General conversation
-            addMessage(data.message, 'assistant');
-        } else if (data.type === 'error') {
-            // Error message
-            addMessage(`Error: ${data.message}`, 'assistant');
+        if (window.EventSource) {
+            await streamAnalysis(message);
+        } else {
+            await fetchAnalysis(message);
         }
-
     } catch (error) {
         console.error('Error:', error);
         addMessage(`Error: ${error.message}. Make sure the server is running.`, 'assistant');
@@ -88,6 +55,96 @@ async function sendMessage() {
     }
 }
 
+// Stream analysis over server-sent events so cards and AI text show up as soon as they're ready
+function streamAnalysis(message) {
+    return new Promise((resolve) => {
+        const source = new EventSource(`/api/analyze/stream?message=${encodeURIComponent(message)}`);
+        const analysisElements = [];
+
+        source.addEventListener('properties', (event) => {
+            const data = JSON.parse(event.data);
+
+            addMessage(`Found ${data.count} properties:`, 'assistant');
+            data.properties.forEach((prop) => {
+                analysisElements.push(displayPropertyAnalysis({
+                    property_data: prop.property_data,
+                    deal_analysis: prop.deal_analysis,
+                    repair_estimate: prop.repair_estimate,
+                    ai_analysis: '',
+                    address: prop.property_data.address
+                }));
+            });
+        });
+
+        source.addEventListener('analysis', (event) => {
+            const data = JSON.parse(event.data);
+            const element = analysisElements[data.index];
+
+            if (element) {
+                element.textContent += data.text;
+                chatContainer.scrollTop = chatContainer.scrollHeight;
+            }
+        });
+
+        source.addEventListener('done', () => {
+            source.close();
+            resolve();
+        });
+
+        // Fired both for server "error" events (with data) and connection failures (without)
+        source.addEventListener('error', (event) => {
+            if (event.data) {
+                addMessage(`Error: ${JSON.parse(event.data).message}`, 'assistant');
+            } else {
+                addMessage('Error: Connection lost. Make sure the server is running.', 'assistant');
+            }
+            source.close();
+            resolve();
+        });
+    });
+}
+
+// Fetch the full analysis in one response (fallback when EventSource is unavailable)
+async function fetchAnalysis(message) {
+    // Call API - use relative URL so it works on any deployment
+    const response = await fetch('/api/analyze', {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+        },
+        body: JSON.stringify({ message: message })
+    });
+
+    const data = await response.json();
+
+    // Handle different response types
+    if (data.type === 'analysis') {
+        // Check if multiple properties
+        if (data.properties && data.properties.length > 0) {
+            // Multiple properties
+            addMessage(`Found ${data.count} properties:`, 'assistant');
+            data.properties.forEach((prop, index) => {
+                displayPropertyAnalysis({
+                    property_data: prop.property_data,
+                    deal_analysis: prop.deal_analysis,
+                    repair_estimate: prop.repair_estimate,
+                    ai_analysis: prop.ai_analysis,
+                    address: prop.property_data.address
+                });
+            });
+        } else {
+            // Single property (old format)
+            displayPropertyAnalysis(data);
+        }
+    } else if (data.type === 'conversation' || data.type === 'chat') {
+        // General conversation
+        addMessage(data.message, 'assistant');
+    } else if (data.type === 'error') {
+        // Error message
+        addMessage(`Error: ${data.message}`, 'assistant');
+    }
+}
+
 // Add message to chat
 function addMessage(text, sender) {
     const messageDiv = document.createElement('div');
@@ -104,7 +161,7 @@ function addMessage(text, sender) {
     chatContainer.scrollTop = chatContainer.scrollHeight;
 }
 
-// Display full property analysis
+// Display full property analysis, returning the element holding the AI analysis text
 function displayPropertyAnalysis(data) {
     const { property_data, deal_analysis, repair_estimate, ai_analysis, address } = data;
 
@@ -178,7 +235,7 @@ function displayPropertyAnalysis(data) {
             </div>
 
             <div class="analysis-section">
-                <strong style="color: #e7e9ea; font-size: 15px;">Analysis:</strong><br><br>${ai_analysis}
+                <strong style="color: #e7e9ea; font-size: 15px;">Analysis:</strong><br><br><span class="analysis-text">${ai_analysis}</span>
             </div>
         </div>
     `;
@@ -197,6 +254,8 @@ function displayPropertyAnalysis(data) {
 
     // Scroll to bottom
     chatContainer.scrollTop = chatContainer.scrollHeight;
+
+    return contentDiv.querySelector('.analysis-text');
 }
 
 // Set loading state
@@ -0,0 +1,91 @@
+"""
+Shared TTL cache for upstream API responses
+
+Values are strings stored in Redis when a URL is configured, otherwise
+in an in-process TTL cache.
+"""
+
+import threading
+from cachetools import TTLCache
+from typing import Optional
+
+try:
+    import redis
+except ImportError:  # Redis is optional - fall back to the in-process cache
+    redis = None
+
+
+class ResponseCache:
+    """
+    String cache with a fixed TTL, backed by Redis or process memory
+
+    Redis errors are treated as misses so a cache outage never fails a
+    request.
+    """
+
+    def __init__(self, redis_url: str = "", ttl_seconds: int = 3600, maxsize: int = 1024, prefix: str = ""):
+        """
+        Args:
+            redis_url: Redis connection URL; empty to cache in process memory
+            ttl_seconds: How long entries live
+            maxsize: Maximum entries in the in-process cache
+            prefix: Key prefix, so clear() only touches this cache's keys
+        """
+        self.ttl_seconds = ttl_seconds
+        self.prefix = prefix
+        self.stats = {"hits": 0, "misses": 0}
+
+        self._lock = threading.Lock()
+        self._memory = TTLCache(maxsize=maxsize, ttl=ttl_seconds)
+        self._redis = None
+
+        if redis_url:
+            if redis is None:
+                print("⚠️  WARNING: REDIS_URL is set but the redis package is not installed, caching in memory")
+            else:
+                self._redis = redis.Redis.from_url(redis_url)
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached value for key, or None on a miss"""
+        value = None
+
+        if self._redis is not None:
+            try:
+                cached = self._redis.get(key)
+                if cached is not None:
+                    value = cached.decode()
+            except redis.RedisError as e:
+                print(f"⚠️  Redis cache read failed: {e}")
+        else:
+            with self._lock:
+                value = self._memory.get(key)
+
+        with self._lock:
+            self.stats["hits" if value is not None else "misses"] += 1
+
+        return value
+
+    def set(self, key: str, value: str):
+        """Store a value under key for ttl_seconds"""
+        if self._redis is not None:
+            try:
+                self._redis.setex(key, self.ttl_seconds, value)
+            except redis.RedisError as e:
+                print(f"⚠️  Redis cache write failed: {e}")
+        else:
+            with self._lock:
+                self._memory[key] = value
+
+    def clear(self):
+        """Drop all cached values and reset the stats"""
+        if self._redis is not None:
+            try:
+                keys = list(self._redis.scan_iter(match=self.prefix + "*"))
+                if keys:
+                    self._redis.delete(*keys)
+            except redis.RedisError as e:
+                print(f"⚠️  Redis cache clear failed: {e}")
+
+        with self._lock:
+            self._memory.clear()
+            self.stats = {"hits": 0, "misses": 0}
@@ -3,6 +3,7 @@ Real Estate Investment Deal Calculator
 Calculates key metrics for fix-and-flip and rental properties
 """
 
+from functools import lru_cache
 from typing import Dict, List
 import sys
 import os
@@ -15,6 +16,12 @@ from config import (
     ARV_MULTIPLIER
 )
 
+# ARV estimate when none is given: 115% of list price (conservative)
+ARV_ESTIMATE_FACTOR = 1.15
+# Holding and selling costs as a fraction of ARV
+HOLDING_COST_PERCENT = 0.02
+SELLING_COST_PERCENT = 0.08
+
 
 def calculate_arv_from_comps(comparable_properties: List[Dict]) -> float:
     """
@@ -47,23 +54,49 @@ def estimate_repair_costs(property_info: Dict) -> Dict:
     Returns:
         Dictionary with repair cost estimates
     """
-    sqft = property_info.get("sqft", 0)
-    year_built = property_info.get("year_built", 2020)
+    estimate = _estimate_repair_costs(
+        property_info.get("sqft", 0),
+        property_info.get("year_built", 2020)
+    )
+
+    # Copy so callers can't mutate the cached entry
+    return {**estimate, "breakdown": dict(estimate["breakdown"])}
+
+
+def clear_repair_cache():
+    """Drop all cached repair estimates"""
+    _estimate_repair_costs.cache_clear()
+
 
-    # Default per sqft repair costs
-    # Light: $10-15/sqft, Medium: $25-35/sqft, Heavy: $50-75/sqft
+# Default per sqft repair costs by property age
+# Light: $10-15/sqft, Medium: $25-35/sqft, Heavy: $50-75/sqft
+_REPAIR_TIERS = (
+    (10, "light", 12.50),
+    (30, "medium", 30),
+    (None, "heavy", 62.50)
+)
+
+
+def _property_age(year_built) -> int:
+    """Age in years, or 0 when the build year is unknown"""
     current_year = 2025
-    age = current_year - int(year_built) if isinstance(year_built, (int, str)) and str(year_built).isdigit() else 0
-
-    if age < 10:
-        repair_level = "light"
-        cost_per_sqft = 12.50
-    elif age < 30:
-        repair_level = "medium"
-        cost_per_sqft = 30
-    else:
-        repair_level = "heavy"
-        cost_per_sqft = 62.50
+    try:
+        return current_year - int(year_built)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _repair_tier(age: int):
+    """(repair level, cost per sqft) for a property of the given age"""
+    for max_age, repair_level, cost_per_sqft in _REPAIR_TIERS:
+        if max_age is None or age < max_age:
+            return repair_level, cost_per_sqft
+
+
+@lru_cache(maxsize=2048)
+def _estimate_repair_costs(sqft, year_built) -> Dict:
+    """Cached repair estimate keyed by (sqft, year_built)"""
+    repair_level, cost_per_sqft = _repair_tier(_property_age(year_built))
 
     estimated_repairs = sqft * cost_per_sqft
 
@@ -72,9 +105,7 @@ def estimate_repair_costs(property_info: Dict) -> Dict:
         "cost_per_sqft": cost_per_sqft,
         "estimated_total": round(estimated_repairs, 2),
         "breakdown": {
-            "light": round(sqft * 12.50, 2),
-            "medium": round(sqft * 30, 2),
-            "heavy": round(sqft * 62.50, 2)
+            level: round(sqft * tier_cost, 2) for _, level, tier_cost in _REPAIR_TIERS
         }
     }
 
@@ -97,7 +128,7 @@ def calculate_max_allowable_offer(arv: float, repair_costs: float, target_profit
     # Alternative: Target profit method
     # MAO = ARV - Repair Costs - Target Profit - Holding Costs
     target_profit = arv * target_profit_percent
-    estimated_holding_costs = arv * 0.02  # 2% of ARV for holding costs
+    estimated_holding_costs = arv * HOLDING_COST_PERCENT
     profit_based_mao = arv - repair_costs - target_profit - estimated_holding_costs
 
     return {
@@ -111,6 +142,16 @@ def calculate_max_allowable_offer(arv: float, repair_costs: float, target_profit
     }
 
 
+# Deal ratings from best to worst: list price at or below MAO, within 5%,
+# within 15%, above that
+_DEAL_RATINGS = (
+    ("EXCELLENT", "Strong buy - property is below MAO"),
+    ("GOOD", "Negotiate - close to MAO, try to lower price"),
+    ("MARGINAL", "Risky - only proceed if you can negotiate significantly"),
+    ("POOR", "Pass - property is overpriced for investment")
+)
+
+
 def analyze_deal(property_info: Dict, arv: float = None, repair_costs: float = None) -> Dict:
     """
     Complete deal analysis for a property
@@ -132,9 +173,9 @@ def analyze_deal(property_info: Dict, arv: float = None, repair_costs: float = N
     else:
         repair_estimate = {"estimated_total": repair_costs, "repair_level": "user_provided"}
 
-    # Use provided ARV or estimate at 115% of current price (conservative)
+    # Use provided ARV or estimate it from the current price
     if arv is None:
-        arv = current_price * 1.15
+        arv = current_price * ARV_ESTIMATE_FACTOR
 
     # Calculate MAO
     mao_calc = calculate_max_allowable_offer(arv, repair_costs)
@@ -146,17 +187,13 @@ def analyze_deal(property_info: Dict, arv: float = None, repair_costs: float = N
 
     # Determine deal quality
     if current_price <= mao_calc["recommended_mao"]:
-        deal_rating = "EXCELLENT"
-        recommendation = "Strong buy - property is below MAO"
+        deal_rating, recommendation = _DEAL_RATINGS[0]
     elif current_price <= mao_calc["recommended_mao"] * 1.05:
-        deal_rating = "GOOD"
-        recommendation = "Negotiate - close to MAO, try to lower price"
+        deal_rating, recommendation = _DEAL_RATINGS[1]
     elif current_price <= mao_calc["recommended_mao"] * 1.15:
-        deal_rating = "MARGINAL"
-        recommendation = "Risky - only proceed if you can negotiate significantly"
+        deal_rating, recommendation = _DEAL_RATINGS[2]
     else:
-        deal_rating = "POOR"
-        recommendation = "Pass - property is overpriced for investment"
+        deal_rating, recommendation = _DEAL_RATINGS[3]
 
     return {
         "property_address": property_info.get("address", "N/A"),
@@ -174,7 +211,7 @@ def analyze_deal(property_info: Dict, arv: float = None, repair_costs: float = N
             "purchase_price": current_price,
             "repair_costs": round(repair_costs, 2),
             "holding_costs": mao_calc["estimated_holding_costs"],
-            "selling_costs": round(arv * 0.08, 2),  # 8% for selling costs
+            "selling_costs": round(arv * SELLING_COST_PERCENT, 2),
             "total_costs": round(total_cost, 2),
             "arv": round(arv, 2),
             "net_profit": round(potential_profit, 2)
@@ -182,57 +219,67 @@ def analyze_deal(property_info: Dict, arv: float = None, repair_costs: float = N
     }
 
 
-def format_deal_analysis_report(analysis: Dict) -> str:
-    """
-    Format deal analysis into a readable report
+_SEP_EQ = "=" * 60
+_SEP_LINE = "─" * 40
 
-    Args:
-        analysis: Deal analysis dictionary
-
-    Returns:
-        Formatted string report
-    """
-    report = f"""
-{'='*60}
+# Report layout; breakdown fields are flattened to breakdown_<name>
+_REPORT_TEMPLATE = f"""
+{_SEP_EQ}
 DEAL ANALYSIS REPORT
-{'='*60}
+{_SEP_EQ}
 
 PROPERTY DETAILS
 ----------------
-Address: {analysis['property_address']}
-Current List Price: ${analysis['current_list_price']:,.2f}
+Address: {{property_address}}
+Current List Price: ${{current_list_price:,.2f}}
 
 VALUATION
 ---------
-After Repair Value (ARV): ${analysis['arv']:,.2f}
-Estimated Repairs ({analysis['repair_level']}): ${analysis['estimated_repairs']:,.2f}
-Maximum Allowable Offer (MAO): ${analysis['max_allowable_offer']:,.2f}
+After Repair Value (ARV): ${{arv:,.2f}}
+Estimated Repairs ({{repair_level}}): ${{estimated_repairs:,.2f}}
+Maximum Allowable Offer (MAO): ${{max_allowable_offer:,.2f}}
 
 INVESTMENT ANALYSIS
 -------------------
-Total Investment Required: ${analysis['total_investment']:,.2f}
-Potential Profit: ${analysis['potential_profit']:,.2f}
-Return on Investment (ROI): {analysis['roi_percentage']:.2f}%
+Total Investment Required: ${{total_investment:,.2f}}
+Potential Profit: ${{potential_profit:,.2f}}
+Return on Investment (ROI): {{roi_percentage:.2f}}%
 
-DEAL RATING: {analysis['deal_rating']}
-{'='*60}
+DEAL RATING: {{deal_rating}}
+{_SEP_EQ}
 
 RECOMMENDATION
 --------------
-{analysis['recommendation']}
+{{recommendation}}
 
 COST BREAKDOWN
 --------------
-Purchase Price:     ${analysis['detailed_breakdown']['purchase_price']:,.2f}
-Repair Costs:       ${analysis['detailed_breakdown']['repair_costs']:,.2f}
-Holding Costs:      ${analysis['detailed_breakdown']['holding_costs']:,.2f}
-Selling Costs (8%): ${analysis['detailed_breakdown']['selling_costs']:,.2f}
-                    {'─'*40}
-Total Costs:        ${analysis['detailed_breakdown']['total_costs']:,.2f}
-ARV:                ${analysis['detailed_breakdown']['arv']:,.2f}
-                    {'─'*40}
-Net Profit:         ${analysis['detailed_breakdown']['net_profit']:,.2f}
-
-{'='*60}
+Purchase Price:     ${{breakdown_purchase_price:,.2f}}
+Repair Costs:       ${{breakdown_repair_costs:,.2f}}
+Holding Costs:      ${{breakdown_holding_costs:,.2f}}
+Selling Costs (8%): ${{breakdown_selling_costs:,.2f}}
+                    {_SEP_LINE}
+Total Costs:        ${{breakdown_total_costs:,.2f}}
+ARV:                ${{breakdown_arv:,.2f}}
+                    {_SEP_LINE}
+Net Profit:         ${{breakdown_net_profit:,.2f}}
+
+{_SEP_EQ}
 """
-    return report
+
+
+def format_deal_analysis_report(analysis: Dict) -> str:
+    """
+    Format deal analysis into a readable report
+
+    Args:
+        analysis: Deal analysis dictionary
+
+    Returns:
+        Formatted string report
+    """
+    fields = dict(analysis)
+    for name, value in analysis["detailed_breakdown"].items():
+        fields["breakdown_" + name] = value
+
+    return _REPORT_TEMPLATE.format_map(fields)
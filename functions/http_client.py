@@ -0,0 +1,94 @@
+"""
+Shared HTTP client setup for external API calls
+"""
+
+import atexit
+import httpx
+import pybreaker
+from tenacity import retry, stop_after_attempt, wait_exponential_jitter, retry_if_exception
+
+# Status codes worth retrying: rate limits and transient server errors
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# Longest Retry-After we'll sleep for inside a request
+MAX_RETRY_AFTER = 5.0
+
+
+def create_client(**kwargs) -> httpx.Client:
+    """
+    Create a pooled HTTP/2 client that lives for the whole process
+
+    HTTP/2 lets concurrent requests to the same host share one TLS
+    connection. The client is closed automatically at interpreter exit.
+
+    Args:
+        **kwargs: Extra httpx.Client options
+
+    Returns:
+        Configured httpx.Client
+    """
+    client = httpx.Client(
+        http2=True,
+        timeout=httpx.Timeout(15.0, connect=3.05),
+        limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+        **kwargs
+    )
+    atexit.register(client.close)
+    return client
+
+
+def is_transient_error(exc: BaseException) -> bool:
+    """Whether a failed request is worth retrying"""
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code in RETRY_STATUS_CODES
+    return isinstance(exc, httpx.TransportError)
+
+
+_backoff = wait_exponential_jitter(initial=0.3, max=2.0)
+
+
+def _wait_for_retry(retry_state) -> float:
+    """
+    Seconds to wait before the next attempt
+
+    Honors a Retry-After header (in seconds, capped at MAX_RETRY_AFTER)
+    on 429/503 responses, otherwise uses jittered exponential backoff.
+    """
+    exc = retry_state.outcome.exception()
+    if isinstance(exc, httpx.HTTPStatusError):
+        retry_after = exc.response.headers.get("Retry-After", "").strip()
+        if retry_after.isdigit():
+            return min(float(retry_after), MAX_RETRY_AFTER)
+
+    return _backoff(retry_state)
+
+
+# Retry transient failures up to 3 attempts with jittered exponential backoff
+retry_transient = retry(
+    stop=stop_after_attempt(3),
+    wait=_wait_for_retry,
+    retry=retry_if_exception(is_transient_error),
+    reraise=True
+)
+
+
+def create_breaker(name: str) -> pybreaker.CircuitBreaker:
+    """
+    Create a circuit breaker for one upstream API
+
+    Opens after 5 consecutive transient failures (each already retried)
+    and then fails fast for 30 seconds instead of piling requests onto a
+    service that is down. Non-transient errors such as a 400 don't count.
+
+    Args:
+        name: Upstream name, used in error messages
+
+    Returns:
+        Configured pybreaker.CircuitBreaker
+    """
+    return pybreaker.CircuitBreaker(
+        fail_max=5,
+        reset_timeout=30,
+        exclude=[lambda e: not is_transient_error(e)],
+        name=name
+    )
@@ -0,0 +1,52 @@
+"""
+Response cache for DeepSeek completions
+
+Entries are keyed by a SHA-256 hash of the request (model, messages,
+temperature) and stored in Redis when REDIS_URL is set, otherwise in an
+in-process TTL cache.
+"""
+
+import hashlib
+import orjson
+from typing import Dict, List, Optional
+from functions.cache import ResponseCache
+
+
+class LLMCache(ResponseCache):
+    """
+    Cache of LLM responses keyed by request hash
+
+    Only deterministic (temperature 0) requests are cached - sampled
+    responses differ run to run, so reusing one would change behavior.
+    """
+
+    def __init__(self, redis_url: str = "", ttl_seconds: int = 14400, maxsize: int = 1024, prefix: str = "llm:"):
+        """
+        Args:
+            redis_url: Redis connection URL; empty to cache in process memory
+            ttl_seconds: How long entries live (default: 4 hours)
+            maxsize: Maximum entries in the in-process cache
+            prefix: Key prefix, so clear() only touches this cache's keys
+        """
+        super().__init__(redis_url, ttl_seconds, maxsize, prefix)
+
+    def cache_key(self, model: str, messages: List[Dict], temperature: float) -> Optional[str]:
+        """
+        Build the cache key for a chat completion request
+
+        Args:
+            model: Model name
+            messages: List of message objects with role and content
+            temperature: Sampling temperature
+
+        Returns:
+            Cache key, or None if the request should not be cached
+        """
+        if temperature > 0:
+            return None
+
+        request = orjson.dumps(
+            {"model": model, "messages": messages, "temperature": temperature},
+            option=orjson.OPT_SORT_KEYS
+        )
+        return self.prefix + hashlib.sha256(request).hexdigest()
@@ -2,69 +2,156 @@
 Realtor API wrapper for fetching property data
 """
 
-import requests
-from typing import Dict, List, Optional
+import hashlib
+import httpx
+import orjson
+import pybreaker
+from typing import Callable, Dict, List, Optional
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from config import RAPIDAPI_KEY, RAPIDAPI_HOST, RAPIDAPI_BASE_URL
+from config import RAPIDAPI_KEY, RAPIDAPI_HOST, RAPIDAPI_BASE_URL, REDIS_URL, REALTOR_CACHE_TTL, DEBUG_RAW
+from functions.cache import ResponseCache
+from functions.http_client import create_client, create_breaker, retry_transient
+
+# Shared HTTP/2 client so Realtor calls reuse one warm TLS connection;
+# base URL and RapidAPI headers are set once here rather than on every call
+_CLIENT = create_client(
+    base_url=RAPIDAPI_BASE_URL,
+    headers={
+        "X-RapidAPI-Host": RAPIDAPI_HOST,
+        "X-RapidAPI-Key": RAPIDAPI_KEY
+    }
+)
+
+# Fails Realtor calls fast while the API is down
+_BREAKER = create_breaker("Realtor")
+
+# Successful Realtor responses keyed by normalized request parameters,
+# shared across workers when REDIS_URL is set
+_CACHE = ResponseCache(REDIS_URL, ttl_seconds=REALTOR_CACHE_TTL, maxsize=512, prefix="realtor:")
+
+
+@_BREAKER
+@retry_transient
+def _post(path: str, payload: Dict) -> Dict:
+    """POST to the Realtor API, retrying transient failures"""
+    response = _CLIENT.post(path, json=payload)
+    response.raise_for_status()
+    return orjson.loads(response.content)
+
+
+def _cache_key(*params) -> str:
+    """Cache key for a Realtor request from its normalized parameters"""
+    return "realtor:" + hashlib.sha256("|".join(str(p) for p in params).encode()).hexdigest()
+
+
+def _cached(key: str, fetch: Callable[[], Dict]) -> Dict:
+    """
+    Return the cached response for key, or fetch and cache it
+
+    Only successful responses are cached. The result's "cached" flag
+    tells whether it came from the cache.
+    """
+    cached = _CACHE.get(key)
+    if cached is not None:
+        result = orjson.loads(cached)
+        result["cached"] = True
+        return result
+
+    result = fetch()
+
+    if result.get("success"):
+        _CACHE.set(key, orjson.dumps(result).decode())
+
+    result["cached"] = False
+    return result
+
+
+def clear_property_cache():
+    """Drop all cached Realtor responses"""
+    _CACHE.clear()
+
+
+def property_cache_stats() -> Dict:
+    """Realtor response cache hit/miss counts"""
+    return _CACHE.stats
 
 
 def get_property_details(address: str) -> Dict:
     """
     Fetch property details from Realtor API by address
 
+    Successful lookups are cached per normalized address. The search is
+    by city (and ZIP code when given); "exact_match" tells whether the
+    returned listing is at the requested street address or only the
+    newest listing in that area.
+
     Args:
-        address: Full property address (e.g., "123 Main St, Austin, TX")
+        address: Full property address (e.g., "123 Main St, Austin, TX 78701")
 
     Returns:
         Dictionary containing property details
     """
-    url = f"{RAPIDAPI_BASE_URL}/properties/v3/list"
+    key = _cache_key("address", address.strip().lower())
+    return _cached(key, lambda: _fetch_property_details(address))
 
-    headers = {
-        "Content-Type": "application/json",
-        "X-RapidAPI-Host": RAPIDAPI_HOST,
-        "X-RapidAPI-Key": RAPIDAPI_KEY
-    }
 
+def _fetch_property_details(address: str) -> Dict:
+    """Uncached Realtor API lookup behind get_property_details"""
     # Parse address - extract city if possible
     payload = {
-        "limit": 1,
+        "limit": 20,
         "offset": 0,
         "status": ["for_sale", "ready_to_build"],
         "sort": {"direction": "desc", "field": "list_date"}
     }
 
-    # Try to extract postal code from address
+    # Split "street, city, ST 12345" into the fields the API can filter on
     parts = address.split(',')
+    street = parts[0].replace(".", "").strip().lower() if len(parts) > 2 else ""
     if len(parts) >= 2:
         city = parts[-2].strip()
-        state = parts[-1].strip().split()[0] if len(parts) > 2 else ""
+        state_zip = parts[-1].split() if len(parts) > 2 else []
         payload["city"] = city
-        if state:
-            payload["state_code"] = state
+        if state_zip:
+            payload["state_code"] = state_zip[0]
+        if len(state_zip) > 1 and state_zip[1].isdigit():
+            payload["postal_code"] = state_zip[1]
 
     try:
-        response = requests.post(url, headers=headers, json=payload)
-        response.raise_for_status()
-        data = response.json()
+        data = _post("/properties/v3/list", payload)
 
         if data.get("data") and data["data"].get("home_search"):
             properties = data["data"]["home_search"].get("results", [])
             if properties:
-                return {
+                # The API can't filter by street, so look for it among the area's listings
+                match = next(
+                    (p for p in properties
+                     if street and (((p.get("location") or {}).get("address") or {}).get("line") or "").replace(".", "").lower() == street),
+                    None
+                )
+                result = {
                     "success": True,
-                    "property": properties[0],
-                    "raw_data": data
+                    "property": match or properties[0],
+                    "exact_match": match is not None
                 }
+                # The full API response is large; only keep it when debugging
+                if DEBUG_RAW:
+                    result["raw_data"] = data
+                return result
 
         return {
             "success": False,
             "error": "No property found at this address"
         }
 
-    except requests.exceptions.RequestException as e:
+    except pybreaker.CircuitBreakerError:
+        return {
+            "success": False,
+            "error": "Realtor API temporarily unavailable - please try again shortly"
+        }
+    except (httpx.HTTPError, ValueError) as e:
         return {
             "success": False,
             "error": f"API Error: {str(e)}"
@@ -75,6 +162,8 @@ def get_comparable_properties(city: str, state: str, max_price: int, min_price:
     """
     Fetch comparable properties (comps) in the same area
 
+    Successful searches are cached per normalized parameters.
+
     Args:
         city: City name
         state: State code (e.g., "TX")
@@ -85,14 +174,12 @@ def get_comparable_properties(city: str, state: str, max_price: int, min_price:
     Returns:
         Dictionary containing comparable properties
     """
-    url = f"{RAPIDAPI_BASE_URL}/properties/v3/list"
+    key = _cache_key(city.strip().lower(), state.strip().upper(), min_price, max_price, limit)
+    return _cached(key, lambda: _fetch_comparable_properties(city, state, max_price, min_price, limit))
 
-    headers = {
-        "Content-Type": "application/json",
-        "X-RapidAPI-Host": RAPIDAPI_HOST,
-        "X-RapidAPI-Key": RAPIDAPI_KEY
-    }
 
+def _fetch_comparable_properties(city: str, state: str, max_price: int, min_price: int, limit: int) -> Dict:
+    """Uncached Realtor API search behind get_comparable_properties"""
     payload = {
         "limit": limit,
         "offset": 0,
@@ -104,9 +191,7 @@ def get_comparable_properties(city: str, state: str, max_price: int, min_price:
     }
 
     try:
-        response = requests.post(url, headers=headers, json=payload)
-        response.raise_for_status()
-        data = response.json()
+        data = _post("/properties/v3/list", payload)
 
         if data.get("data") and data["data"].get("home_search"):
             properties = data["data"]["home_search"].get("results", [])
@@ -121,7 +206,12 @@ def get_comparable_properties(city: str, state: str, max_price: int, min_price:
             "error": "No comparable properties found"
         }
 
-    except requests.exceptions.RequestException as e:
+    except pybreaker.CircuitBreakerError:
+        return {
+            "success": False,
+            "error": "Realtor API temporarily unavailable - please try again shortly"
+        }
+    except (httpx.HTTPError, ValueError) as e:
         return {
             "success": False,
             "error": f"API Error: {str(e)}"
@@ -138,14 +228,15 @@ def extract_property_info(property_data: Dict) -> Dict:
     Returns:
         Cleaned and formatted property information
     """
-    description = property_data.get("description", {})
-    location = property_data.get("location", {})
+    description = property_data.get("description") or {}
+    location = property_data.get("location") or {}
+    address = location.get("address") or {}
 
     return {
-        "address": location.get("address", {}).get("line", "N/A"),
-        "city": location.get("address", {}).get("city", "N/A"),
-        "state": location.get("address", {}).get("state_code", "N/A"),
-        "zip_code": location.get("address", {}).get("postal_code", "N/A"),
+        "address": address.get("line", "N/A"),
+        "city": address.get("city", "N/A"),
+        "state": address.get("state_code", "N/A"),
+        "zip_code": address.get("postal_code", "N/A"),
         "price": property_data.get("list_price", 0),
         "bedrooms": description.get("beds", 0),
         "bathrooms": description.get("baths", 0),
@@ -0,0 +1,142 @@
+"""
+Semantic cache for free-form chat questions
+
+Answers are reused for questions whose embeddings are close enough
+("what's a good ROI?" vs "what ROI should I target?"), not just for
+identical text. Requires the optional sentence-transformers package.
+"""
+
+import threading
+import time
+from typing import Optional, Tuple
+
+try:
+    import numpy as np
+    from sentence_transformers import SentenceTransformer
+except ImportError:  # Optional - the chat endpoint works uncached without it
+    SentenceTransformer = None
+
+
+class SemanticCache:
+    """
+    In-process cache of chat answers looked up by cosine similarity
+
+    Embeddings are L2-normalized, so an inner product against the stored
+    matrix is an exact cosine search (the same as a FAISS IndexFlatIP);
+    at a few thousand entries that takes well under a millisecond.
+    """
+
+    def __init__(self, model_name: str = "sentence-transformers/all-MiniLM-L6-v2", threshold: float = 0.92,
+                 ttl_seconds: int = 3600, max_entries: int = 2000):
+        """
+        Args:
+            model_name: Sentence embedding model (loaded on first use)
+            threshold: Minimum cosine similarity that counts as a hit
+            ttl_seconds: How long answers are reused (default: 1 hour)
+            max_entries: Oldest answers are evicted beyond this many
+        """
+        if SentenceTransformer is None:
+            raise ImportError("SemanticCache requires the sentence-transformers package")
+
+        self.model_name = model_name
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.stats = {"hits": 0, "misses": 0}
+
+        self._model = None
+        self._model_lock = threading.Lock()
+        # Set if the model can't be loaded; every lookup is then a miss
+        self.disabled = False
+        self._lock = threading.Lock()
+
+        # Entries are kept in insertion order, so expired ones are always a prefix
+        self._vectors = None
+        self._answers = []
+        self._created = []
+
+    def _embed(self, text: str):
+        """Normalized embedding of text as a float32 vector, or None if the model is unavailable"""
+        with self._model_lock:
+            if self.disabled:
+                return None
+
+            if self._model is None:
+                try:
+                    self._model = SentenceTransformer(self.model_name, device="cpu")
+                except Exception as e:  # Download or load failure - run uncached rather than fail chat
+                    print(f"⚠️  WARNING: could not load {self.model_name} ({e}), semantic chat cache disabled")
+                    self.disabled = True
+                    return None
+
+        return self._model.encode(text, normalize_embeddings=True, convert_to_numpy=True).astype(np.float32)
+
+    def _drop_oldest(self, count: int):
+        """Remove the count oldest entries (caller holds _lock)"""
+        if count <= 0:
+            return
+
+        self._vectors = self._vectors[count:] if count < len(self._answers) else None
+        del self._answers[:count]
+        del self._created[:count]
+
+    def get(self, question: str) -> Tuple[Optional[str], object]:
+        """
+        Look up a cached answer for a similar question
+
+        Args:
+            question: User question
+
+        Returns:
+            Tuple of (cached answer or None, question embedding to pass to
+            put); both are None while the cache is disabled
+        """
+        vector = self._embed(question)
+        answer = None
+
+        if vector is None:
+            return None, None
+
+        with self._lock:
+            cutoff = time.monotonic() - self.ttl_seconds
+            expired = 0
+            while expired < len(self._created) and self._created[expired] < cutoff:
+                expired += 1
+            self._drop_oldest(expired)
+
+            if self._vectors is not None:
+                scores = self._vectors @ vector
+                best = int(np.argmax(scores))
+                if scores[best] > self.threshold:
+                    answer = self._answers[best]
+
+            self.stats["hits" if answer is not None else "misses"] += 1
+
+        return answer, vector
+
+    def put(self, vector, answer: str):
+        """
+        Store an answer under a question embedding returned by get
+
+        Args:
+            vector: Question embedding
+            answer: Answer to reuse for similar questions
+        """
+        if vector is None:
+            return
+
+        with self._lock:
+            row = vector.reshape(1, -1)
+            self._vectors = row if self._vectors is None else np.vstack((self._vectors, row))
+            self._answers.append(answer)
+            self._created.append(time.monotonic())
+
+            self._drop_oldest(len(self._answers) - self.max_entries)
+
+    def clear(self):
+        """Drop all cached answers and reset the stats"""
+        with self._lock:
+            self._vectors = None
+            self._answers = []
+            self._created = []
+            self.stats = {"hits": 0, "misses": 0}
@@ -0,0 +1,24 @@
+"""
+Gunicorn configuration for serving the Flask app in production
+
+Run with: gunicorn wsgi:app
+"""
+
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+
+wsgi_app = "wsgi:app"
+
+# One process per core. Requests spend nearly all their time waiting on
+# DeepSeek/Realtor I/O, so each process serves many at once: gthread
+# workers use a small thread pool; GUNICORN_WORKER_CLASS=gevent switches
+# to greenlets, which hold far more concurrent (streaming) connections.
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gthread")
+threads = 4  # gthread only
+worker_connections = 200  # gevent only
+
+# Streamed analyses keep a connection open until the last token arrives
+timeout = 60
@@ -0,0 +1,78 @@
+"""
+Tests for the local search request parser
+
+parse_search_query decides whether /api/analyze skips the DeepSeek parse,
+so anything it marks complete must be parsed exactly right.
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from app import parse_search_query
+
+
+class ParseSearchQueryTest(unittest.TestCase):
+
+    def test_complete_search(self):
+        self.assertEqual(parse_search_query("3 deals in Dallas, TX under 300k"), {
+            "city": "Dallas",
+            "state": "TX",
+            "max_price": 300000,
+            "count": 3,
+            "complete": True
+        })
+
+    def test_multi_word_city_and_dollar_amount(self):
+        guess = parse_search_query("homes in San Antonio, TX under $250,000")
+        self.assertEqual((guess["city"], guess["state"], guess["max_price"]), ("San Antonio", "TX", 250000))
+        self.assertTrue(guess["complete"])
+
+    def test_count_is_capped(self):
+        self.assertEqual(parse_search_query("10 homes in Austin, TX under 400k")["count"], 3)
+
+    def test_leading_verb_is_not_trusted(self):
+        for message in [
+            "Find Austin, TX homes under 300k",
+            "Search Houston, TX under 250k",
+            "Show Dallas, TX deals under 400k",
+            "Analyze Miami, FL under 500k",
+        ]:
+            with self.subTest(message=message):
+                self.assertFalse(parse_search_query(message)["complete"])
+
+    def test_leading_city_is_not_complete(self):
+        guess = parse_search_query("Austin, TX under 300k")
+        self.assertEqual((guess["city"], guess["state"]), ("Austin", "TX"))
+        self.assertFalse(guess["complete"])
+
+    def test_floors_and_ranges_are_not_complete(self):
+        for message in [
+            "homes in Dallas, TX over 300k",
+            "homes in Dallas, TX at least 200k",
+            "homes in Dallas, TX between 200k and 400k",
+        ]:
+            with self.subTest(message=message):
+                self.assertFalse(parse_search_query(message)["complete"])
+
+    def test_implausible_ceiling_is_not_complete(self):
+        guess = parse_search_query("max 5 properties in Dallas, TX")
+        self.assertEqual(guess["max_price"], 1000000)
+        self.assertFalse(guess["complete"])
+
+    def test_bare_amount_is_not_a_ceiling(self):
+        self.assertFalse(parse_search_query("rentals in Dallas, TX with $1,500 rent")["complete"])
+
+    def test_punctuated_cities_are_left_to_deepseek(self):
+        for message in ["homes in St. Louis, MO under 200k", "homes in Winston-Salem, NC under 200k"]:
+            with self.subTest(message=message):
+                guess = parse_search_query(message)
+                self.assertTrue(guess is None or not guess["complete"])
+
+    def test_no_location(self):
+        self.assertIsNone(parse_search_query("what's a good ROI for a flip?"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,7 @@
+"""
+WSGI entry point for production servers
+
+Run with: gunicorn wsgi:app
+"""
+
+from app import app